@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
+import logging
 import sys
-import time
-import traceback
+from dataclasses import dataclass
 
 import dbus
 from dbus.mainloop.glib import DBusGMainLoop
@@ -16,8 +16,20 @@ from gi.repository import GLib, Gtk  # type: ignore
 DBusGMainLoop(set_as_default=True)
 
 
-def log(msg: str) -> None:
-    print(f"[popup] {msg}", flush=True)
+logger = logging.getLogger("popup")
+
+
+@dataclass(slots=True)
+class CallEntry:
+    """Per-call bookkeeping; slots keep the once-per-second tick on
+    C-level attribute access instead of dict lookups."""
+
+    caller_id: str
+    state: str
+    window: "CallWindow | None"
+    iface: object
+    start_time: int | None = None
+    last_elapsed: int = -1
 
 
 class CallWindow(Gtk.Window):
@@ -38,6 +50,11 @@ class CallWindow(Gtk.Window):
         self.state_label.set_xalign(0)
         vbox.pack_start(self.state_label, False, False, 0)
 
+        # Remember what each label shows so identical updates (every timer
+        # tick, repeated state signals) skip set_text and the redraw it queues.
+        self._last_state_text = "Incoming call"
+        self._last_timer_text = "00:00"
+
         self.caller_label = Gtk.Label(label=f"From: {caller_text}")
         self.caller_label.set_xalign(0)
         vbox.pack_start(self.caller_label, False, False, 0)
@@ -50,40 +67,64 @@ class CallWindow(Gtk.Window):
         vbox.pack_start(button_box, False, False, 0)
 
         self.answer_btn = Gtk.Button(label="Answer")
-        self.answer_btn.connect("clicked", lambda *_: on_answer())
+        self._answer_hid = self.answer_btn.connect("clicked", lambda *_: on_answer())
         button_box.pack_start(self.answer_btn, True, True, 0)
 
         self.hangup_btn = Gtk.Button(label="Hang up")
-        self.hangup_btn.connect("clicked", lambda *_: on_hangup())
+        self._hangup_hid = self.hangup_btn.connect("clicked", lambda *_: on_hangup())
         button_box.pack_start(self.hangup_btn, True, True, 0)
 
+    def destroy(self) -> None:
+        # The clicked closures capture the app and call path; disconnect
+        # them explicitly so call churn doesn't pile up reference cycles
+        # for the garbage collector.
+        if self._answer_hid is not None:
+            self.answer_btn.disconnect(self._answer_hid)
+            self.hangup_btn.disconnect(self._hangup_hid)
+            self._answer_hid = self._hangup_hid = None
+        super().destroy()
+
+    def _set_state_text(self, text: str) -> None:
+        if text != self._last_state_text:
+            self._last_state_text = text
+            self.state_label.set_text(text)
+
+    def _set_timer_text(self, text: str) -> None:
+        if text != self._last_timer_text:
+            self._last_timer_text = text
+            self.timer_label.set_text(text)
+
     def show_incoming(self) -> None:
-        self.state_label.set_text("Incoming call")
+        self._set_state_text("Incoming call")
         self.answer_btn.set_sensitive(True)
         self.hangup_btn.set_sensitive(True)
-        self.timer_label.set_text("Ringing…")
+        self._set_timer_text("Ringing…")
         self.present()
 
     def show_active(self) -> None:
-        self.state_label.set_text("Call in progress")
+        self._set_state_text("Call in progress")
         self.answer_btn.set_sensitive(False)
         self.hangup_btn.set_sensitive(True)
         self.present()
 
     def update_timer_label(self, seconds: int) -> None:
         mins, secs = divmod(max(seconds, 0), 60)
-        self.timer_label.set_text(f"{mins:02d}:{secs:02d}")
+        self._set_timer_text(f"{mins:02d}:{secs:02d}")
 
 
 class PopupApp:
     def __init__(self):
         self.bus = dbus.SessionBus()
-        self.calls = {}  # call_path -> data dict
+        self.calls = {}  # call_path -> CallEntry
+        self._timer_id = None  # single shared 1s tick for all active calls
+        self._dirty = {}  # call_path -> latest pending state
+        self._flush_id = None
         self._subscribe()
+        self._seed_existing_calls()
 
     # -------------------- DBus wiring -------------------- #
     def _subscribe(self) -> None:
-        log("Subscribing to PipeWire telephony signals")
+        logger.info("Subscribing to PipeWire telephony signals")
         try:
             self.bus.add_signal_receiver(
                 self.on_interfaces_added,
@@ -99,18 +140,60 @@ class PopupApp:
                 bus_name="org.pipewire.Telephony",
                 path="/org/pipewire/Telephony/ag1",
             )
+            # arg0 goes into the AddMatch rule, so dbus-daemon drops
+            # PropertiesChanged from unrelated interfaces before they ever
+            # reach us instead of us unmarshalling and discarding them.
             self.bus.add_signal_receiver(
                 self.on_properties_changed,
                 dbus_interface="org.freedesktop.DBus.Properties",
                 signal_name="PropertiesChanged",
                 bus_name="org.pipewire.Telephony",
+                arg0="org.pipewire.Telephony.Call1",
                 path_keyword="path",
             )
         except Exception as exc:  # pragma: no cover - runtime wiring
-            log(f"Failed to subscribe: {exc}")
-            traceback.print_exc()
+            logger.exception("Failed to subscribe: %s", exc)
             sys.exit(1)
 
+    def _seed_existing_calls(self) -> None:
+        """Pick up calls that were already up when we started.
+
+        Signals only cover calls created after we subscribe; one bulk
+        GetManagedObjects round-trip catches e.g. a call surviving a
+        crash-restart of the popup.
+        """
+        try:
+            # get_object resolves the name owner synchronously and throws
+            # if the telephony service hasn't claimed its name yet (e.g.
+            # we came up first at login); treat that like a failed seed.
+            om = dbus.Interface(
+                self.bus.get_object(
+                    "org.pipewire.Telephony",
+                    "/org/pipewire/Telephony/ag1",
+                    introspect=False,
+                ),
+                "org.freedesktop.DBus.ObjectManager",
+            )
+        except dbus.DBusException as exc:
+            logger.info("Seed failed: %s", exc)
+            return
+        om.GetManagedObjects(
+            reply_handler=self._seed_calls,
+            error_handler=lambda exc: logger.info("Seed failed: %s", exc),
+        )
+
+    def _seed_calls(self, objects) -> None:
+        for path, interfaces in objects.items():
+            call_props = interfaces.get("org.pipewire.Telephony.Call1")
+            if not call_props:
+                continue
+            state = call_props.get("State", "")
+            if state not in ("incoming", "active"):
+                continue
+            caller_id = call_props.get("LineIdentification", "Unknown")
+            logger.info("Existing call: %s (state=%s) path=%s", caller_id, state, path)
+            self._show_window(path, caller_id, initial_state=state)
+
     # -------------------- Signal handlers -------------------- #
     def on_interfaces_added(self, path, interfaces, **_kwargs):
         """New call appeared."""
@@ -120,7 +203,7 @@ class PopupApp:
 
         state = call_props.get("State", "")
         caller_id = call_props.get("LineIdentification", "Unknown")
-        log(f"Incoming call: {caller_id} (state={state}) path={path}")
+        logger.info("Incoming call: %s (state=%s) path=%s", caller_id, state, path)
 
         if state == "incoming":
             self._show_window(path, caller_id, initial_state="incoming")
@@ -129,7 +212,7 @@ class PopupApp:
         """Call removed (ended)."""
         if "org.pipewire.Telephony.Call1" not in interfaces:
             return
-        log(f"Call removed: {path}")
+        logger.info("Call removed: %s", path)
         self._close_call(path)
 
     def on_properties_changed(self, interface, changed_props, _invalidated, **kwargs):
@@ -143,17 +226,29 @@ class PopupApp:
         call_path = kwargs.get("path")
         if not call_path:
             return
-        log(f"State changed: {call_path} -> {state}")
-
-        if state == "active":
-            self._mark_active(call_path)
-        elif state == "disconnected":
-            self._close_call(call_path)
+        logger.debug("State changed: %s -> %s", call_path, state)
+
+        # Coalesce bursts: record only the newest state per call and apply
+        # them all in one idle callback, so a flurry of transitions within
+        # a single loop iteration causes a single UI update.
+        self._dirty[call_path] = state
+        if self._flush_id is None:
+            self._flush_id = GLib.idle_add(self._flush_dirty)
+
+    def _flush_dirty(self) -> bool:
+        self._flush_id = None
+        dirty, self._dirty = self._dirty, {}
+        for call_path, state in dirty.items():
+            if state == "active":
+                self._mark_active(call_path)
+            elif state == "disconnected":
+                self._close_call(call_path)
+        return False
 
     # -------------------- UI helpers -------------------- #
     def _show_window(self, call_path: str, caller_id: str, initial_state: str) -> None:
         if call_path in self.calls:
-            self.calls[call_path]["window"].present()
+            self.calls[call_path].window.present()
             return
 
         window = CallWindow(
@@ -165,13 +260,19 @@ class PopupApp:
         window.connect("destroy", lambda *_: self._close_call(call_path))
         window.show_all()
 
-        self.calls[call_path] = {
-            "caller_id": caller_id or "Unknown",
-            "state": initial_state,
-            "window": window,
-            "start_time": None,
-            "timer_id": None,
-        }
+        self.calls[call_path] = CallEntry(
+            caller_id=caller_id or "Unknown",
+            state=initial_state,
+            window=window,
+            # Cached proxy for Answer/Hangup; introspect=False skips the
+            # XML round-trip since we only call known methods.
+            iface=dbus.Interface(
+                self.bus.get_object(
+                    "org.pipewire.Telephony", call_path, introspect=False
+                ),
+                "org.pipewire.Telephony.Call1",
+            ),
+        )
 
         if initial_state == "active":
             self._mark_active(call_path)
@@ -183,70 +284,100 @@ class PopupApp:
         if not call:
             return
 
-        call["state"] = "active"
-        call["start_time"] = time.monotonic()
-        call["window"].show_active()
-
-        if call["timer_id"]:
-            GLib.source_remove(call["timer_id"])
-
-        # Start 1-second timer to update label
-        call["timer_id"] = GLib.timeout_add_seconds(
-            1, lambda: self._update_timer(call_path)
-        )
-        self._update_timer(call_path)
-
-    def _update_timer(self, call_path: str) -> bool:
-        call = self.calls.get(call_path)
-        if not call or call["state"] != "active" or call["start_time"] is None:
-            return False
-
-        elapsed = int(time.monotonic() - call["start_time"])
-        call["window"].update_timer_label(elapsed)
-        return True  # keep the timer running
+        call.state = "active"
+        # µs int from GLib; cheaper on the tick path than time.monotonic()'s
+        # boxed float.
+        call.start_time = GLib.get_monotonic_time()
+        call.last_elapsed = -1
+        call.window.show_active()
+        self._update_timer(call)
+
+        # One shared 1-second tick updates every active call, so the process
+        # wakes once per second no matter how many calls are up.
+        if self._timer_id is None:
+            self._timer_id = GLib.timeout_add_seconds(1, self._tick)
+
+    def _tick(self) -> bool:
+        active = False
+        for call in self.calls.values():
+            if call.state == "active" and call.start_time is not None:
+                self._update_timer(call)
+                active = True
+
+        if not active:
+            self._timer_id = None
+            return False  # nothing to time; re-armed on the next active call
+        return True
+
+    def _update_timer(self, call: CallEntry) -> None:
+        elapsed = (GLib.get_monotonic_time() - call.start_time) // 1_000_000
+        # Timeouts can drift and fire twice within the same wall-second;
+        # skip the divmod/format work when the displayed second hasn't moved.
+        if elapsed == call.last_elapsed:
+            return
+        call.last_elapsed = elapsed
+        call.window.update_timer_label(elapsed)
 
     def _close_call(self, call_path: str) -> None:
         call = self.calls.pop(call_path, None)
         if not call:
             return
 
-        if call["timer_id"]:
-            GLib.source_remove(call["timer_id"])
         try:
-            call["window"].destroy()
+            call.window.destroy()
         except Exception:
             pass
-        log(f"Closed call UI for {call_path}")
+        # Drop the strong refs too; the dict may outlive this scope in a
+        # pending closure, and the proxy/window have no further use.
+        call.window = None
+        call.iface = None
+        logger.debug("Closed call UI for %s", call_path)
 
     # -------------------- Call control -------------------- #
-    def _get_call_iface(self, call_path: str):
-        call_obj = self.bus.get_object("org.pipewire.Telephony", call_path)
-        return dbus.Interface(call_obj, "org.pipewire.Telephony.Call1")
-
     def answer_call(self, call_path: str) -> None:
-        log(f"Answering {call_path}")
-        try:
-            self._get_call_iface(call_path).Answer()
-        except Exception as exc:
-            log(f"Answer failed: {exc}")
-            traceback.print_exc()
+        call = self.calls.get(call_path)
+        if not call:
+            return
+        logger.info("Answering %s", call_path)
+        # Grey out immediately; re-enabled only if the call fails.
+        call.window.answer_btn.set_sensitive(False)
+        call.iface.Answer(
+            reply_handler=lambda: logger.debug("Answered %s", call_path),
+            error_handler=lambda exc: self._on_answer_error(call_path, exc),
+        )
+
+    def _on_answer_error(self, call_path: str, exc) -> None:
+        logger.error("Answer failed: %s", exc)
+        call = self.calls.get(call_path)
+        if call:
+            call.window.answer_btn.set_sensitive(True)
 
     def hangup_call(self, call_path: str) -> None:
-        log(f"Hanging up {call_path}")
-        try:
-            self._get_call_iface(call_path).Hangup()
-        except Exception as exc:
-            log(f"Hangup failed: {exc}")
-            traceback.print_exc()
+        call = self.calls.get(call_path)
+        if not call:
+            return
+        logger.info("Hanging up %s", call_path)
+        call.window.hangup_btn.set_sensitive(False)
+        call.iface.Hangup(
+            reply_handler=lambda: logger.debug("Hung up %s", call_path),
+            error_handler=lambda exc: self._on_hangup_error(call_path, exc),
+        )
+
+    def _on_hangup_error(self, call_path: str, exc) -> None:
+        logger.error("Hangup failed: %s", exc)
+        call = self.calls.get(call_path)
+        if call:
+            call.window.hangup_btn.set_sensitive(True)
 
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="[popup] %(message)s")
     app = PopupApp()
-    log("Ready for calls (GTK popup)")
+    logger.info("Ready for calls (GTK popup)")
     try:
         Gtk.main()
     except KeyboardInterrupt:
-        log("Exiting...")
+        logger.info("Exiting...")
         sys.exit(0)
 
 